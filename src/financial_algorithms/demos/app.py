@@ -1,6 +1,5 @@
 from flask import Blueprint, render_template, request, jsonify
-from financial_algorithms import simulate_loan
-import pandas as pd
+from financial_algorithms import simulate_loan_result
 import os
 from utils.logger_config import configure_logger
 
@@ -29,42 +28,15 @@ def simulate():
     if target_months is not None:
         target_months = int(target_months)
 
-    logger.info(f"Simulating loan with amount: {loan_amount}, interest: {annual_interest_rate}, EMI: {emi}, Target Months: {target_months}, Lump Sums: {lump_sums}")
+    logger.info(
+        "Simulating loan with amount: %s, interest: %s, EMI: %s, Target Months: %s, Lump Sums: %s",
+        loan_amount, annual_interest_rate, emi, target_months, lump_sums
+    )
 
     try:
-        schedule_df = simulate_loan(loan_amount, annual_interest_rate, emi=emi, target_months=target_months, lump_sums=lump_sums)
-
-        # Convert relevant columns to numeric, removing '₹' and ','
-        numeric_cols = ['EMI', 'Interest Paid', 'Principal Paid', 'Remaining Balance']
-        for col in numeric_cols:
-            if col in schedule_df.columns:
-                schedule_df[col] = schedule_df[col].astype(str).str.replace('₹', '').str.replace(',', '').replace('', '0').astype(float)
-
-        total_interest_payable = schedule_df['Interest Paid'].sum()
-        total_payment = schedule_df['EMI'].sum()
-        num_months = len(schedule_df)
-        num_years = num_months / 12
-
-        # Prepare schedule data for JSON response, mapping to frontend expectations
-        schedule_data = []
-        for i, row in schedule_df.iterrows():
-            opening_balance = loan_amount if i == 0 else schedule_df.loc[i-1, 'Remaining Balance'] + schedule_df.loc[i-1, 'Principal Paid']
-            schedule_data.append({
-                'month': int(row['Month']),
-                'opening_balance': opening_balance,
-                'emi': row['EMI'],
-                'interest': row['Interest Paid'],
-                'principal': row['Principal Paid'],
-                'closing_balance': row['Remaining Balance']
-            })
+        result = simulate_loan_result(loan_amount, annual_interest_rate, emi=emi, target_months=target_months, lump_sums=lump_sums)
         logger.info("Loan simulation successful.")
-        return jsonify({
-            'total_interest_payable': total_interest_payable,
-            'total_payment': total_payment,
-            'num_months': num_months,
-            'num_years': num_years,
-            'schedule': schedule_data
-        })
+        return jsonify({**result.totals, 'schedule': result.records})
     except ValueError as e:
-        logger.error(f"Loan simulation failed: {e}")
+        logger.error("Loan simulation failed: %s", e)
         return jsonify({'error': str(e)}), 400
\ No newline at end of file
@@ -0,0 +1,76 @@
+"""
+Numeric core of the month-by-month amortization loop.
+
+``_amortize`` is compiled with ``numba.njit`` when numba is installed and
+runs as plain Python otherwise, so numba stays an optional dependency.
+"""
+
+import numpy as np
+
+try:
+    from numba import njit
+except ModuleNotFoundError:
+    def njit(*args, **kwargs):
+        """No-op stand-in for ``numba.njit`` when numba is not installed."""
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return lambda func: func
+
+# Balances this close to zero count as repaid, so floating-point residue
+# does not add an extra near-empty month.
+_PAID_OFF_TOLERANCE = 1e-6
+
+
+@njit(cache=True)
+def _amortize(balance, r, emi, lump_by_month, max_months):
+    """
+    Simulate repayments month by month.
+
+    Args:
+        balance: Loan amount (float).
+        r: Monthly interest rate (float).
+        emi: Fixed monthly payment (float).
+        lump_by_month: ``float64`` array of length ``max_months + 1`` holding
+            the extra payment for each month (index 0 is unused).
+        max_months: Safeguard on the number of simulated months.
+
+    Returns:
+        ``(n, emis, lumps, interests, principals, balances)`` where only the
+        first ``n`` entries of each array are filled. ``principals`` includes
+        the lump sum paid in that month.
+    """
+    emis = np.empty(max_months)
+    lumps = np.empty(max_months)
+    interests = np.empty(max_months)
+    principals = np.empty(max_months)
+    balances = np.empty(max_months)
+
+    month = 0
+    while balance > 0 and month < max_months:
+        interest = balance * r
+        # Check if EMI is too low *after* interest is calculated for the current month
+        if emi < interest:
+            raise ValueError("EMI is too low to cover even the interest. Loan will never be repaid.")
+
+        principal_payment = emi - interest
+        lump_sum = lump_by_month[month + 1]
+        if principal_payment + lump_sum > balance - _PAID_OFF_TOLERANCE:
+            principal_payment = balance - lump_sum
+            if principal_payment < 0:
+                principal_payment = 0.0
+                lump_sum = balance
+            emi = interest + principal_payment
+        balance -= principal_payment + lump_sum
+
+        emis[month] = emi
+        lumps[month] = lump_sum
+        interests[month] = interest
+        principals[month] = principal_payment + lump_sum
+        balances[month] = max(balance, 0.0)
+        month += 1
+    return month, emis, lumps, interests, principals, balances
+
+
+# Compile (or load from the on-disk cache) at import so the first request
+# does not pay the JIT cost.
+_amortize(1.0, 0.0, 1.0, np.zeros(2), 1)
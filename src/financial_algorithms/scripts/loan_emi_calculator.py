@@ -1,5 +1,11 @@
-__all__ = ['calculate_emi', 'simulate_loan', 'INR']
+__all__ = ['calculate_emi', 'simulate_loan', 'simulate_loan_result', 'SimResult', 'print_schedule', 'format_inr_df', 'INR']
 
+import logging
+import math
+from functools import lru_cache
+from typing import NamedTuple
+
+import numpy as np
 import pandas as pd
 try:
     # Project‑specific logger configuration; fallback to a simple console logger.
@@ -17,18 +23,146 @@ except ModuleNotFoundError:
     _add_project_root_to_sys_path()
     from utils.logger_config import configure_logger
 
+try:
+    from ._amort_kernel import _amortize
+except ImportError:
+    # Run as a script: this directory is on ``sys.path`` instead of the package.
+    from _amort_kernel import _amortize
+
 logger = configure_logger()
 
 # Utility to format currency
 INR = lambda x: f"₹{int(round(x)):,}"
 
+MAX_MONTHS = 1200  # Safeguard to prevent infinite loops (100 years)
+
+# Schedule columns, in order; every column after Month holds rupee amounts
+SCHEDULE_COLUMNS = ('Month', 'EMI', 'Lump Sum', 'Interest Paid', 'Principal Paid', 'Remaining Balance')
+AMOUNT_COLUMNS = SCHEDULE_COLUMNS[1:]
+
+# Keys of the per-month records served as JSON
+RECORD_KEYS = ('month', 'opening_balance', 'emi', 'interest', 'principal', 'closing_balance')
+
+class SimResult(NamedTuple):
+    """
+    A simulated schedule together with its JSON-ready records and totals.
+    """
+    df: pd.DataFrame
+    records: list
+    totals: dict
+
+def format_inr_df(df):
+    """
+    Return a copy of a repayment schedule with amount columns formatted as INR strings.
+    Empty lump sums are shown as blanks.
+    """
+    formatted = df.assign(**{c: df[c].map(INR) for c in AMOUNT_COLUMNS if c in df.columns})
+    if 'Lump Sum' in df.columns:
+        formatted['Lump Sum'] = formatted['Lump Sum'].where(df['Lump Sum'] > 0, '')
+    return formatted
+
 def calculate_emi(P, r, n):
     """
     Calculate EMI for given principal, monthly rate, and months.
     """
+    # P*r*(1+r)^n / ((1+r)^n - 1) == P*r / (1 - (1+r)^-n); expm1/log1p keep
+    # this accurate for small r and the denominator is 0 only when r == 0.
+    denom = -math.expm1(-n * math.log1p(r))
+    return P * r / denom if denom else P / n
+
+def _solve_emi(P, r, n, lump_sums):
+    """
+    Calculate the EMI that repays P in n months when lump sums are also paid.
+    - lump_sums: dict {month: amount}
+    The balance after n months is linear in the EMI, so instead of iterating
+    the schedule the lump sums are discounted to their present value and the
+    standard EMI formula is applied to what is left.
+    """
+    pv_lumps = sum(a * (1 + r) ** -m for m, a in lump_sums.items() if 1 <= m <= n)
+    if pv_lumps >= P:
+        raise ValueError("Lump sums alone repay the loan within target_months; no EMI is needed.")
+    return calculate_emi(P - pv_lumps, r, n)
+
+def _fixed_emi_schedule(P, r, emi):
+    """
+    Closed-form amortization for a fixed EMI without lump sums.
+    Returns (emis, interest, principal, balance) arrays, one entry per month.
+    """
+    if P <= 0:
+        empty = np.empty(0)
+        return empty, empty, empty, empty
+    if emi < P * r:
+        raise ValueError("EMI is too low to cover even the interest. Loan will never be repaid.")
+
+    # Months needed to bring balance_k = P*(1+r)^k - EMI*((1+r)^k - 1)/r to zero.
     if r == 0:
-        return P / n
-    return P * r * (1 + r) ** n / ((1 + r) ** n - 1)
+        months_needed = P / emi if emi > 0 else np.inf
+    elif emi > P * r:
+        months_needed = np.log(emi / (emi - P * r)) / np.log1p(r)
+    else:
+        months_needed = np.inf
+    # Tolerance keeps floating-point noise from adding an empty trailing month.
+    paid_off = months_needed <= MAX_MONTHS
+    n = max(1, int(np.ceil(months_needed - 1e-9))) if paid_off else MAX_MONTHS
+
+    k = np.arange(1.0, n + 1)
+    if r == 0:
+        balance = P - emi * k
+    else:
+        growth = np.power(1 + r, k)
+        balance = P * growth - emi * (growth - 1) / r
+    opening = np.concatenate(([P], balance[:-1]))
+    interest = opening * r
+    principal = emi - interest
+    emis = np.full(n, float(emi))
+    if paid_off:
+        # The last instalment only pays off what is left.
+        principal[-1] = opening[-1]
+        emis[-1] = interest[-1] + principal[-1]
+        balance[-1] = 0
+    np.maximum(balance, 0.0, out=balance)
+    return emis, interest, principal, balance
+
+def _schedule_frame(emis, lumps, interests, principals, balances):
+    """
+    Assemble the repayment schedule column by column from per-month arrays.
+    The arrays are copied so callers never write into cached results.
+    """
+    columns = (np.arange(1, len(emis) + 1), emis, lumps, interests, principals, balances)
+    return pd.DataFrame(dict(zip(SCHEDULE_COLUMNS, columns)), copy=True)
+
+@lru_cache(maxsize=1024)
+def _simulate_core(loan_amount, monthly_interest_rate, emi, lump_sums):
+    """
+    Compute the repayment schedule arrays; a pure function of its inputs.
+    - lump_sums: tuple of (month, amount) pairs sorted by month
+    Returns read-only (emis, lumps, interests, principals, balances) arrays.
+    """
+    if not lump_sums:
+        emis, interests, principals, balances = _fixed_emi_schedule(
+            loan_amount, monthly_interest_rate, emi
+        )
+        lumps = np.zeros(len(emis))
+    else:
+        # Dense per-month lookup: one array load per month instead of a search.
+        lump_by_month = np.zeros(MAX_MONTHS + 1)
+        for m, a in lump_sums:
+            if 1 <= m <= MAX_MONTHS:
+                lump_by_month[m] = a
+        month, emis, lumps, interests, principals, balances = _amortize(
+            float(loan_amount), float(monthly_interest_rate), float(emi),
+            lump_by_month, MAX_MONTHS
+        )
+        # Copies, so the cache does not keep the full MAX_MONTHS buffers alive.
+        emis, lumps, interests, principals, balances = (
+            emis[:month].copy(), lumps[:month].copy(), interests[:month].copy(),
+            principals[:month].copy(), balances[:month].copy()
+        )
+
+    arrays = (emis, lumps, interests, principals, balances)
+    for array in arrays:
+        array.setflags(write=False)
+    return arrays
 
 def simulate_loan(
     loan_amount,
@@ -41,78 +175,94 @@ def simulate_loan(
     Simulate a home loan repayment with flexible EMI, optional lump sum(s), or target months.
     - emi: fixed monthly payment (if None and target_months is set, will be calculated)
     - lump_sums: dict {month: amount} or list of (month, amount) for extra payments
-    - target_months: if set, calculate EMI to finish in this many months
+    - target_months: if set, calculate EMI to finish in this many months (taking lump sums into account)
+    Schedules are cached on the inputs, so repeated calls are cheap.
     """
     monthly_interest_rate = annual_interest_rate / 12 / 100
-    schedule = []
-    balance = loan_amount
-    month = 0
-    total_interest_paid = 0
     lump_sums = lump_sums or {}
     if isinstance(lump_sums, list):
         lump_sums = dict(lump_sums)
+    # Month keys may arrive as strings (e.g. from JSON)
+    lump_sums = {int(m): float(a) for m, a in lump_sums.items()}
 
     # Calculate EMI if target_months is given
     if emi is None and target_months is not None:
-        emi = calculate_emi(balance, monthly_interest_rate, target_months)
-        logger.info(f"To finish in {target_months} months, you need to pay EMI: {INR(emi)}")
+        emi = _solve_emi(loan_amount, monthly_interest_rate, target_months, lump_sums)
+        logger.info("To finish in %s months, you need to pay EMI: %s", target_months, INR(emi))
     elif emi is None:
         raise ValueError("You must specify either emi or target_months.")
 
-    # Calculate EMI if target_months is given
-    if emi is None and target_months is not None:
-        emi = calculate_emi(balance, monthly_interest_rate, target_months)
-        logger.info(f"To finish in {target_months} months, you need to pay EMI: {INR(emi)}")
-    elif emi is None:
-        raise ValueError("You must specify either emi or target_months.")
+    emis, lumps, interests, principals, balances = _simulate_core(
+        loan_amount, monthly_interest_rate, emi, tuple(sorted(lump_sums.items()))
+    )
+    df = _schedule_frame(emis, lumps, interests, principals, balances)
+    if df.empty:
+        raise ValueError("Loan amount must be greater than zero and result in a valid schedule.")
+
+    # Rendering the table is costly; only do it when debugging.
+    if logger.isEnabledFor(logging.DEBUG):
+        print_schedule(df)
+    return df
+
+def simulate_loan_result(
+    loan_amount,
+    annual_interest_rate,
+    emi=None,
+    lump_sums=None,
+    target_months=None
+):
+    """
+    Simulate a loan like ``simulate_loan`` and also prepare it for serving.
+    Returns a ``SimResult`` whose ``records`` hold one dict per month keyed by
+    ``RECORD_KEYS`` and whose ``totals`` hold total_interest_payable,
+    total_payment, num_months and num_years.
+    """
+    df = simulate_loan(loan_amount, annual_interest_rate, emi=emi, lump_sums=lump_sums, target_months=target_months)
+
+    interests = df['Interest Paid'].to_numpy()
+    principals = df['Principal Paid'].to_numpy()
+    balances = df['Remaining Balance'].to_numpy()
+    # A month opens with what it closes with plus the principal repaid in it.
+    columns = (
+        df['Month'].tolist(),
+        (balances + principals).tolist(),
+        df['EMI'].tolist(),
+        interests.tolist(),
+        principals.tolist(),
+        balances.tolist(),
+    )
+    records = [dict(zip(RECORD_KEYS, row)) for row in zip(*columns)]
+
+    total_interest_payable = float(interests.sum())
+    totals = {
+        'total_interest_payable': total_interest_payable,
+        # Principal Paid includes lump sums, so this is everything paid to the lender
+        'total_payment': total_interest_payable + float(principals.sum()),
+        'num_months': len(df),
+        'num_years': len(df) / 12,
+    }
+    return SimResult(df=df, records=records, totals=totals)
+
+def print_schedule(df):
+    """
+    Log the first 24 months of a repayment schedule followed by a summary.
+    """
+    total_interest_paid = df['Interest Paid'].sum()
+    total_paid = total_interest_paid + df['Principal Paid'].sum()
 
-    MAX_MONTHS = 1200  # Safeguard to prevent infinite loops (100 years)
-
-    while balance > 0 and month < MAX_MONTHS:
-        month += 1
-        interest = balance * monthly_interest_rate
-        # Check if EMI is too low *after* interest is calculated for the current month
-        if emi < interest:
-            raise ValueError("EMI is too low to cover even the interest. Loan will never be repaid.")
-
-        principal_payment = emi - interest
-        lump_sum = lump_sums.get(month, 0)
-        total_payment = principal_payment + lump_sum
-        if total_payment > balance:
-            principal_payment = balance - lump_sum
-            if principal_payment < 0:
-                principal_payment = 0
-                lump_sum = balance
-            emi = interest + principal_payment
-        balance -= (principal_payment + lump_sum)
-        total_interest_paid += interest
-        schedule.append({
-            'Month': month,
-            'EMI': INR(emi),
-            'Lump Sum': INR(lump_sum) if lump_sum else '',
-            'Interest Paid': INR(interest),
-            'Principal Paid': INR(principal_payment + lump_sum),
-            'Remaining Balance': INR(balance if balance > 0 else 0)
-        })
-        if balance <= 0:
-            break
-
-    df = pd.DataFrame(schedule)
     logger.info("\nRepayment Schedule (first 24 months or full schedule if shorter):")
-    logger.info(df.head(24).to_string(index=False))
+    logger.info("%s", format_inr_df(df.head(24)).to_string(index=False))
     if len(df) > 24:
-        logger.info(f"... (showing first 24 of {len(df)} months)")
-    logger.info(f"\nSUMMARY:")
-    logger.info(f"  Total Months: {month}")
-    logger.info(f"  Total Interest Paid: {INR(total_interest_paid)}")
-    logger.info(f"  Total Paid: {INR(total_interest_paid + loan_amount)}")
-    if df.empty:
-        raise ValueError("Loan amount must be greater than zero and result in a valid schedule.")
-    logger.info(f"  Last EMI: {df.iloc[-1]['EMI']}")
-    if any(df['Lump Sum']):
-        logger.info(f"  Lump Sums Paid: {', '.join([f'M{m}: {l}' for m, l in zip(df['Month'], df['Lump Sum']) if l])}")
+        logger.info("... (showing first 24 of %d months)", len(df))
+    logger.info("\nSUMMARY:")
+    logger.info("  Total Months: %d", len(df))
+    logger.info("  Total Interest Paid: %s", INR(total_interest_paid))
+    logger.info("  Total Paid: %s", INR(total_paid))
+    logger.info("  Last EMI: %s", INR(df.iloc[-1]['EMI']))
+    paid_lumps = df.loc[df['Lump Sum'] > 0, ['Month', 'Lump Sum']]
+    if not paid_lumps.empty:
+        logger.info("  Lump Sums Paid: %s", ', '.join(f'M{m}: {INR(l)}' for m, l in paid_lumps.itertuples(index=False)))
     logger.info("\n")
-    return df
 
 # --- EXAMPLES TO EXPERIMENT WITH ---
 if __name__ == "__main__":
@@ -120,14 +270,14 @@ if __name__ == "__main__":
     annual_interest_rate = 9.2
 
     logger.info("\n--- Example 1: Fixed EMI ---")
-    simulate_loan(loan_amount, annual_interest_rate, emi=61200)
+    print_schedule(simulate_loan(loan_amount, annual_interest_rate, emi=61200))
 
     logger.info("\n--- Example 2: Fixed EMI + Lump Sums in Month 6 and 12 ---")
-    simulate_loan(
+    print_schedule(simulate_loan(
         loan_amount, annual_interest_rate, emi=61200, lump_sums={6: 100000, 12: 50000}
-    )
+    ))
 
     logger.info("\n--- Example 3: Pay off in months (calculate EMI) ---")
-    simulate_loan(
+    print_schedule(simulate_loan(
         loan_amount, annual_interest_rate, target_months=24
-    )
+    ))
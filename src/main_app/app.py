@@ -11,12 +11,13 @@ def add_project_root_to_sys_path():
     
     from utils.logger_config import configure_logger
     logger = configure_logger()
-    logger.info(f"Added {project_root_str} to sys.path")
+    logger.info("Added %s to sys.path", project_root_str)
 
 add_project_root_to_sys_path()
 
 from flask import Flask, render_template
 from main_app.config import config_by_name
+from main_app.json_provider import json_provider_class
 from financial_algorithms.demos.app import loan_emi_calculator_bp
 from string_algorithms.demos.app import string_subsequence_matching_bp
 from utils.logger_config import configure_logger
@@ -28,6 +29,8 @@ def create_app(config_name='development'):
     
     # Load configuration
     app.config.from_object(config_by_name[config_name])
+    logger.setLevel(app.config['LOG_LEVEL'])
+    app.json = json_provider_class(app)
     
     # Register blueprints
     app.register_blueprint(loan_emi_calculator_bp, url_prefix='/financial_algorithms/loan_emi_calculator')
@@ -14,6 +14,8 @@ class ProductionConfig(Config):
     DEBUG = False
     # More restrictive settings for production
     LOG_LEVEL = 'WARNING'
+    # Already off when DEBUG is False; stated explicitly for production
+    TEMPLATES_AUTO_RELOAD = False
 
 config_by_name = {
     'development': DevelopmentConfig,
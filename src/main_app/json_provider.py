@@ -0,0 +1,48 @@
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    # orjson encodes in C and understands NumPy types; fall back to the stdlib provider.
+    import orjson
+except ModuleNotFoundError:
+    orjson = None
+
+__all__ = ['OrjsonProvider', 'json_provider_class']
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """
+    Flask JSON provider that serializes with ``orjson``.
+
+    NumPy arrays and scalars are encoded natively, so views can pass them to
+    ``jsonify`` without ``.tolist()``. Calls that pass ``json.dumps`` keyword
+    arguments fall back to the default provider.
+    """
+
+    def _option(self):
+        option = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if self.compact is False or (self.compact is None and self._app.debug):
+            option |= orjson.OPT_INDENT_2
+        return option
+
+    def _dumps_bytes(self, obj):
+        return orjson.dumps(obj, default=self.default, option=self._option())
+
+    def dumps(self, obj, **kwargs):
+        if kwargs:
+            return super().dumps(obj, **kwargs)
+        return self._dumps_bytes(obj).decode()
+
+    def loads(self, s, **kwargs):
+        if kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        # Hand the encoded bytes straight to the response, skipping a str round trip.
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(self._dumps_bytes(obj) + b"\n", mimetype=self.mimetype)
+
+
+json_provider_class = OrjsonProvider if orjson is not None else DefaultJSONProvider
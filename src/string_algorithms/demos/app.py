@@ -1,5 +1,5 @@
 from flask import Blueprint, render_template, request, jsonify
-from string_algorithms import calculate_substring_similarity
+from string_algorithms import calculate_substring_similarity, calculate_substring_similarities
 import unicodedata
 
 import os
@@ -26,8 +26,9 @@ def compare():
     normalize = data.get('normalize', False)
 
     logger.info(
-        f"Comparing text: '{text}' with subtext: '{subtext}' "
-        f"(case_sensitive={case_sensitive}, ignore_whitespace={ignore_whitespace}, normalize={normalize})"
+        "Comparing text: '%s' with subtext: '%s' "
+        "(case_sensitive=%s, ignore_whitespace=%s, normalize=%s)",
+        text, subtext, case_sensitive, ignore_whitespace, normalize
     )
 
     results = calculate_substring_similarity(
@@ -39,7 +40,35 @@ def compare():
         # debug=True
     )
     # logger.info(f"{results=}")
-    logger.info(f"String comparison successful.")
+    logger.info("String comparison successful.")
+    return jsonify({'matches': results})
+
+@string_subsequence_matching_bp.route('/compare_batch', methods=['POST'])
+def compare_batch():
+    data = request.get_json()
+    texts = data['texts']
+    subtext = data['subtext']
+    max_dissimilarity = data.get('max_dissimilarity')
+
+    logger.info(
+        "Comparing subtext: '%s' with %d texts (max_dissimilarity=%s)",
+        subtext, len(texts), max_dissimilarity
+    )
+
+    try:
+        results = calculate_substring_similarities(
+            texts,
+            subtext,
+            case_sensitive=data.get('case_sensitive', True),
+            ignore_whitespace=data.get('ignore_whitespace', False),
+            normalize=data.get('normalize', False),
+            matcher=data.get('matcher', 'difflib'),
+            max_dissimilarity=None if max_dissimilarity is None else int(max_dissimilarity),
+        )
+    except ValueError as e:
+        logger.error("Batch string comparison failed: %s", e)
+        return jsonify({'error': str(e)}), 400
+    logger.info("Batch string comparison successful.")
     return jsonify({'matches': results})
 
 @string_subsequence_matching_bp.route('/debug_unicode')
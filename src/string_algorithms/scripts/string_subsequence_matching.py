@@ -5,47 +5,159 @@
 String‑subsequence similarity utilities.
 
 This module provides:
-* ``compare_strings`` – low‑level diff using ``difflib.SequenceMatcher``.
+* ``compare_strings`` – low‑level diff using ``difflib.SequenceMatcher`` (or
+  RapidFuzz's Levenshtein / Indel opcodes on request).
 * ``_calculate_substring_similarity`` – the original metric calculator (kept for
   backward compatibility).
 * ``calculate_substring_similarity`` – a thin wrapper that adds optional
   preprocessing (case‑folding, whitespace removal, Unicode normalization).
+* ``calculate_substring_similarities`` – the same for one ``sub`` against
+  many texts.
 * ``print_comparison_details`` – pretty‑print helper.
 * ``run_examples`` – a set of demo scenarios.
 """
 
+import copy
 import difflib
-import re
+import os
+import string
 import unicodedata
-from typing import List, Tuple, Dict, Any
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from itertools import repeat
+from typing import Iterable, List, Optional, Tuple, Dict, Any
+
+try:
+    # Optional C++ edit-distance backends, used only when asked for via ``matcher``.
+    from rapidfuzz.distance import Indel, Levenshtein
+except ModuleNotFoundError:
+    Indel = Levenshtein = None
 
 __all__ = [
     "calculate_substring_similarity",
+    "calculate_substring_similarities",
     "print_comparison_details",
 ]
 
+MATCHERS = ("difflib", "levenshtein", "indel")
+
+# Fewer distinct texts than this are scored in-process even when ``workers``
+# is given: starting the pool and pickling the results would cost more.
+_PARALLEL_MIN_TEXTS = 1000
+
+# ASCII whitespace as matched by ``str.isspace`` (includes \x1c-\x1f, not just
+# " \t\n\r\v\f"); the table deletes it and lowercases in a single pass.
+_ASCII_WHITESPACE_CHARS = "".join(c for c in map(chr, range(128)) if c.isspace())
+_ASCII_WHITESPACE_LOWER = str.maketrans(string.ascii_uppercase, string.ascii_lowercase, _ASCII_WHITESPACE_CHARS)
+
+
+def _strip_whitespace(value: str) -> str:
+    """Remove every Unicode whitespace character from ``value``."""
+    # ``str.split()`` splits on exactly the characters ``\s`` matches.
+    return "".join(value.split())
+
+
+def _normalize(value: str) -> str:
+    """NFKC-normalize ``value``; ASCII text is already in NFKC form."""
+    return value if value.isascii() else unicodedata.normalize("NFKC", value)
+
+
+def _casefold(value: str) -> str:
+    """Case-fold ``value``; for ASCII this is the same as ``str.lower``."""
+    if value.isascii():
+        # Already-lowercase ASCII needs no copy. Not safe beyond ASCII:
+        # "ß".islower() is true, yet it folds to "ss".
+        return value if value.islower() else value.lower()
+    return value.casefold()
+
+
+def _preprocess(value: str, *, case_sensitive: bool, ignore_whitespace: bool, normalize: bool) -> str:
+    """Apply the preprocessing steps requested in ``calculate_substring_similarity``."""
+    if ignore_whitespace and not case_sensitive and value.isascii():
+        # NFKC is a no-op on ASCII, so one translate pass does everything.
+        return value.translate(_ASCII_WHITESPACE_LOWER)
+
+    # 1. Normalization
+    if normalize:
+        value = _normalize(value)
+    # 2. Whitespace removal; ``\s`` matches any Unicode whitespace character.
+    if ignore_whitespace:
+        value = _strip_whitespace(value)
+    # 3. Case handling; ``casefold`` provides a more aggressive case‑insensitive
+    # mapping than ``str.lower`` and works well across many scripts.
+    if not case_sensitive:
+        value = _casefold(value)
+    return value
+
+
+@lru_cache(maxsize=128)
+def _indexed_matcher(target_text: str) -> difflib.SequenceMatcher:
+    """
+    Return a ``SequenceMatcher`` that has already indexed ``target_text``.
+
+    ``SequenceMatcher`` builds its lookup table for the second sequence, so
+    comparisons against a recurring target only pay for that once. The cached
+    instance is shared; callers must work on a copy.
+    """
+    # No junk characters and no "popular element" heuristic – we want a pure
+    # character‑wise comparison, also for targets of 200+ characters.
+    return difflib.SequenceMatcher(None, "", target_text, autojunk=False)
+
 # ----------------------------------------------------------------------
 # Low‑level diff
 # ----------------------------------------------------------------------
-def compare_strings(source_text: str, target_text: str) -> List[Tuple[str, str, str, int, int]]:
+def _get_opcodes(source_text: str, target_text: str, matcher: str = "difflib") -> Iterable[Tuple[str, int, int, int, int]]:
+    """
+    Return the raw ``(operation, src_start, src_end, tgt_start, tgt_end)``
+    opcodes for two strings; see :func:`compare_strings` for ``matcher``.
+    """
+    if matcher not in MATCHERS:
+        raise ValueError(f"Unknown matcher {matcher!r}; expected one of {MATCHERS}.")
+
+    if matcher == "levenshtein" and Levenshtein is not None:
+        return Levenshtein.opcodes(source_text, target_text)
+    if matcher == "indel" and Indel is not None:
+        return Indel.opcodes(source_text, target_text)
+    indexed_matcher = _indexed_matcher(target_text)
+    # With no character in common there is nothing to match: difflib would
+    # scan the whole source only to report one replacement. ``b2j`` already
+    # holds every character of the target (nothing is junk).
+    if source_text and target_text and indexed_matcher.b2j.keys().isdisjoint(source_text):
+        return [("replace", 0, len(source_text), 0, len(target_text))]
+    # A shallow copy shares the read-only index but not the per-pair state.
+    sequence_matcher = copy.copy(indexed_matcher)
+    sequence_matcher.set_seq1(source_text)
+    return sequence_matcher.get_opcodes()
+
+
+def compare_strings(
+    source_text: str, target_text: str, matcher: str = "difflib"
+) -> List[Tuple[str, str, str, int, int]]:
     """
     Compare two strings and return their differences using ``difflib.SequenceMatcher``.
 
     Args:
         source_text: The source string to compare from.
         target_text: The target string to compare against.
+        matcher: ``"difflib"`` (default), ``"levenshtein"`` or ``"indel"``.
+            The latter two use RapidFuzz's bit-parallel C++ opcodes: Levenshtein
+            aligns the strings with the fewest edits, Indel along a longest
+            common subsequence (inserts and deletes only, no replacements).
+            Both can differ from difflib's longest matching blocks. They fall
+            back to difflib when RapidFuzz is not installed.
+
+    The difflib matcher runs with ``autojunk=False``: characters that are
+    frequent in a long ``target_text`` are still matched rather than treated
+    as junk.
 
     Returns:
         A list of tuples ``(operation, source_substring, target_substring,
         source_start, target_start)`` where *operation* can be
         ``'equal'``, ``'replace'``, ``'delete'`` or ``'insert'``.
     """
-    # ``lambda x: False`` disables junk‑character filtering – we want a pure
-    # character‑wise comparison.
-    sequence_matcher = difflib.SequenceMatcher(lambda x: False, source_text, target_text)
-
     differences = []
-    for operation, src_start, src_end, tgt_start, tgt_end in sequence_matcher.get_opcodes():
+    for operation, src_start, src_end, tgt_start, tgt_end in _get_opcodes(source_text, target_text, matcher):
         differences.append(
             (
                 operation,
@@ -59,81 +171,90 @@ def compare_strings(source_text: str, target_text: str) -> List[Tuple[str, str,
 
 
 # ----------------------------------------------------------------------
-# Original metric calculator (kept untouched)
+# Metric calculator
 # ----------------------------------------------------------------------
-def _calculate_substring_similarity(text: str, subtext: str) -> Dict[str, Any]:
+def _calculate_substring_similarity(text: str, subtext: str, matcher: str = "difflib") -> Dict[str, Any]:
     """
     Calculate similarity metrics between a *text* and a *subtext*.
 
     This implementation is **case‑sensitive** and does **not** ignore whitespace
     or apply Unicode normalization.  It is used internally by the newer
-    ``calculate_substring_similarity`` wrapper.
+    ``calculate_substring_similarity`` wrapper. Results are cached on the
+    inputs, so repeated comparisons are cheap.
 
     Returns:
         A dictionary containing a variety of similarity metrics (see the docstring
         of the original implementation for a full list).
     """
-    matching_segments = []
+    return _copy_metrics(_cached_substring_similarity(text, subtext, matcher))
 
-    for operation, sub1, sub2, i, j in compare_strings(text, subtext):
-        if operation in ["equal", "replace", "insert"]:
-            matching_segments.append((operation, (i, i + len(sub1)), (j, j + len(sub2))))
 
-    # Sort by start index of the *text* side
-    matching_segments.sort(key=lambda x: x[1][0])
-
-    # ------------------------------------------------------------------
-    # Unmatched (gap) detection
-    # ------------------------------------------------------------------
-    unmatched_segments = []
-    for i in range(len(matching_segments) - 1):
-        end_current = matching_segments[i][1][1]
-        start_next = matching_segments[i + 1][1][0]
-        if end_current < start_next:
-            unmatched_segments.append((end_current, start_next))
+def _copy_metrics(results: Dict[str, Any]) -> Dict[str, Any]:
+    """Fresh containers, so callers may modify a result without touching the cache."""
+    return {
+        **results,
+        "matches": list(results["matches"]),
+        "replacements": list(results["replacements"]),
+        "gaps": list(results["gaps"]),
+    }
 
-    # ------------------------------------------------------------------
-    # Collect concrete text fragments for each category
-    # ------------------------------------------------------------------
-    exact_matches = [
-        text[t_range[0] : t_range[1]]
-        for op, t_range, _ in matching_segments
-        if op == "equal"
-    ]
-
-    replacements = [
-        (
-            text[t_range[0] : t_range[1]],
-            subtext[s_range[0] : s_range[1]],
-        )
-        for op, t_range, s_range in matching_segments
-        if op == "replace"
-    ]
 
-    gaps = [text[start:end] for start, end in unmatched_segments]
+@lru_cache(maxsize=256)
+def _cached_substring_similarity(text: str, subtext: str, matcher: str) -> Dict[str, Any]:
+    """Compute the metrics for ``_calculate_substring_similarity``; never mutate the result."""
+    if matcher not in MATCHERS:
+        raise ValueError(f"Unknown matcher {matcher!r}; expected one of {MATCHERS}.")
+
+    # A subtext found verbatim in the text is difflib's longest matching block
+    # (at its first occurrence) with only deletions around it, so the result
+    # is one exact match; skip building the diff. Identical inputs give that
+    # result with every matcher.
+    if text == subtext or (matcher == "difflib" and subtext in text):
+        length = len(subtext)
+        return {
+            "dissimilarity_score": 0,
+            "text_length": len(text),
+            "subtext_length": length,
+            "unmatched_char_count": 0,
+            "matched_char_count": length,
+            "gap_char_count": 0,
+            "inserted_char_count": 0,
+            "replaced_char_count": 0,
+            "matches": [subtext] if subtext else [],
+            "replacements": [],
+            "gaps": [],
+        }
 
     # ------------------------------------------------------------------
-    # Metric aggregation
+    # Single pass over the opcodes: gaps, text fragments and character counts.
+    # Opcodes from every matcher tile the text left to right, so they are
+    # already ordered by their start in *text*. Only index ranges are
+    # handled; text is sliced just for the fragments reported.
     # ------------------------------------------------------------------
-    gap_char_count = sum(end - start for start, end in unmatched_segments)
-
-    matched_char_count = sum(
-        (segment[2][1] - segment[2][0])
-        for segment in matching_segments
-        if segment[0] == "equal"
-    )
-
-    inserted_char_count = sum(
-        (segment[2][1] - segment[2][0])
-        for segment in matching_segments
-        if segment[0] == "insert"
-    )
-
-    replaced_char_count = sum(
-        (segment[1][1] - segment[1][0])
-        for segment in matching_segments
-        if segment[0] == "replace"
-    )
+    exact_matches = []
+    replacements = []
+    gaps = []
+    matched_char_count = inserted_char_count = replaced_char_count = gap_char_count = 0
+
+    previous_end = None
+    for op, t_start, t_end, s_start, s_end in _get_opcodes(text, subtext, matcher):
+        if op == "delete":
+            # Deleted text is not a segment; it shows up as a gap below.
+            continue
+        # Text skipped between two consecutive segments is a gap.
+        if previous_end is not None and previous_end < t_start:
+            gaps.append(text[previous_end:t_start])
+            gap_char_count += t_start - previous_end
+        previous_end = t_end
+
+        if op == "equal":
+            exact_matches.append(text[t_start:t_end])
+            matched_char_count += t_end - t_start  # equal on both sides
+        elif op == "replace":
+            replacements.append((text[t_start:t_end], subtext[s_start:s_end]))
+            replaced_char_count += t_end - t_start
+        else:  # "insert"
+            inserted_char_count += s_end - s_start
 
     text_length = len(text)
     subtext_length = len(subtext)
@@ -168,6 +289,7 @@ def calculate_substring_similarity(
     case_sensitive: bool = True,
     ignore_whitespace: bool = False,
     normalize: bool = False,
+    matcher: str = "difflib",
     debug: bool = False,
 ) -> Dict[str, Any]:
     """
@@ -185,6 +307,8 @@ def calculate_substring_similarity(
         normalize: If ``True``, the strings are normalized using
             ``unicodedata.normalize('NFKC', …)`` to resolve common Unicode
             composition issues (e.g. accented characters). Defaults to ``False``.
+        matcher: Diff backend, ``"difflib"`` (default), ``"levenshtein"`` or ``"indel"``;
+            see :func:`compare_strings`.
         debug: If ``True`` Append meta‑information for debugging / reporting.
 
     Returns:
@@ -193,39 +317,19 @@ def calculate_substring_similarity(
         strings for reference.
     """
     # ------------------------------------------------------------------
-    # 1️⃣  Normalization (if requested)
+    # 1️⃣  Normalization, whitespace removal, case handling (if requested)
     # ------------------------------------------------------------------
-    processed_text = text
-    processed_sub = sub
-
-    if normalize:
-        processed_text = unicodedata.normalize("NFKC", processed_text)
-        processed_sub = unicodedata.normalize("NFKC", processed_sub)
+    options = dict(case_sensitive=case_sensitive, ignore_whitespace=ignore_whitespace, normalize=normalize)
+    processed_text = _preprocess(text, **options)
+    processed_sub = _preprocess(sub, **options)
 
     # ------------------------------------------------------------------
-    # 2️⃣  Whitespace removal (if requested)
+    # 2️⃣  Delegate the heavy lifting to the original implementation.
     # ------------------------------------------------------------------
-    if ignore_whitespace:
-        # ``\\s`` matches any Unicode whitespace character.
-        processed_text = re.sub(r"\s+", "", processed_text)
-        processed_sub = re.sub(r"\s+", "", processed_sub)
+    results = _calculate_substring_similarity(processed_text, processed_sub, matcher)
 
     # ------------------------------------------------------------------
-    # 3️⃣  Case handling (if requested)
-    # ------------------------------------------------------------------
-    if not case_sensitive:
-        # ``casefold`` provides a more aggressive case‑insensitive mapping
-        # than ``str.lower`` and works well across many scripts.
-        processed_text = processed_text.casefold()
-        processed_sub = processed_sub.casefold()
-
-    # ------------------------------------------------------------------
-    # 4️⃣  Delegate the heavy lifting to the original implementation.
-    # ------------------------------------------------------------------
-    results = _calculate_substring_similarity(processed_text, processed_sub)
-
-    # ------------------------------------------------------------------
-    # 5️⃣  Append meta‑information for debugging / reporting.
+    # 3️⃣  Append meta‑information for debugging / reporting.
     # ------------------------------------------------------------------
     if debug == True:
         results.update(
@@ -233,6 +337,7 @@ def calculate_substring_similarity(
                 "case_sensitive": case_sensitive,
                 "ignore_whitespace": ignore_whitespace,
                 "normalize": normalize,
+                "matcher": matcher,
                 "original_text": text,
                 "original_sub": sub,
                 "processed_text": processed_text,
@@ -242,6 +347,93 @@ def calculate_substring_similarity(
     return results
 
 
+def _score_within_limit(
+    text: str, subtext: str, subtext_counts: Optional[Counter], matcher: str, max_dissimilarity: Optional[int]
+) -> Optional[Dict[str, Any]]:
+    """
+    Return the (cached, shared) metrics for one batch entry, or ``None`` if its
+    ``dissimilarity_score`` exceeds ``max_dissimilarity``.
+    """
+    if max_dissimilarity is not None:
+        # Every subtext character not matched counts once, and at most
+        # the characters the two strings share can be matched.
+        if len(subtext) - len(text) > max_dissimilarity:
+            return None
+        text_counts = Counter(text)
+        shared = sum(min(count, text_counts[char]) for char, count in subtext_counts.items())
+        if len(subtext) - shared > max_dissimilarity:
+            return None
+
+    results = _cached_substring_similarity(text, subtext, matcher)
+    if max_dissimilarity is not None and results["dissimilarity_score"] > max_dissimilarity:
+        return None
+    return results
+
+
+def calculate_substring_similarities(
+    texts: Iterable[str],
+    sub: str,
+    *,
+    case_sensitive: bool = True,
+    ignore_whitespace: bool = False,
+    normalize: bool = False,
+    matcher: str = "difflib",
+    max_dissimilarity: Optional[int] = None,
+    workers: Optional[int] = None,
+) -> List[Optional[Dict[str, Any]]]:
+    """
+    Compare one ``sub`` against each of ``texts``.
+
+    Gives the same results as calling :func:`calculate_substring_similarity`
+    for every text, but ``sub`` is preprocessed once, difflib's index of it
+    is built once and shared by all comparisons, and texts that are equal
+    after preprocessing are scored only once.
+
+    Args:
+        texts: The strings in which ``sub`` is searched.
+        sub: The substring (or sub‑sequence) to compare against every text.
+        case_sensitive, ignore_whitespace, normalize, matcher: As for
+            :func:`calculate_substring_similarity`.
+        max_dissimilarity: If given, texts whose ``dissimilarity_score`` would
+            exceed it yield ``None``. Most of them are ruled out from character
+            counts alone, without running the diff.
+        workers: ``None`` (the default), ``-1`` or a positive integer. If
+            given, large batches are scored in this many worker processes
+            (``-1`` for one per CPU); any other value raises ``ValueError``.
+            Scoring is pure Python and holds the GIL, so threads would not
+            help.
+
+    Returns:
+        One metrics dictionary (or ``None``) per text, in the order of ``texts``.
+    """
+    # Checked up front: pruned texts never reach the matcher.
+    if matcher not in MATCHERS:
+        raise ValueError(f"Unknown matcher {matcher!r}; expected one of {MATCHERS}.")
+    # Also checked up front: small batches never start the pool.
+    if workers is not None and workers != -1 and not (isinstance(workers, int) and workers > 0):
+        raise ValueError(f"workers must be None, -1 or a positive integer, not {workers!r}.")
+
+    options = dict(case_sensitive=case_sensitive, ignore_whitespace=ignore_whitespace, normalize=normalize)
+    processed_sub = _preprocess(sub, **options)
+    sub_counts = Counter(processed_sub) if max_dissimilarity is not None else None
+
+    processed_texts = [_preprocess(text, **options) for text in texts]
+    unique_texts = list(dict.fromkeys(processed_texts))
+    args = (repeat(processed_sub), repeat(sub_counts), repeat(matcher), repeat(max_dissimilarity))
+    if workers is not None and len(unique_texts) >= _PARALLEL_MIN_TEXTS:
+        max_workers = (os.cpu_count() or 1) if workers == -1 else workers
+        # Large chunks amortize the per-task pickling.
+        chunksize = max(1, len(unique_texts) // (max_workers * 8))
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            metrics = executor.map(_score_within_limit, unique_texts, *args, chunksize=chunksize)
+            scored = dict(zip(unique_texts, metrics))
+    else:
+        scored = dict(zip(unique_texts, map(_score_within_limit, unique_texts, *args)))
+
+    # Texts equal after preprocessing share one scoring; each gets its own copy.
+    return [None if scored[text] is None else _copy_metrics(scored[text]) for text in processed_texts]
+
+
 # ----------------------------------------------------------------------
 # Pretty‑print helper
 # ----------------------------------------------------------------------
@@ -268,23 +460,23 @@ def print_comparison_details(text: str, subtext: str, results: Dict[str, Any], l
 
     # ``logger`` is injected by the ``if __name__ == '__main__'`` block below.
     logger.info("\nInput Strings:")
-    logger.info(f"Text    : '{text}'")
-    logger.info(f"Subtext : '{subtext}'")
+    logger.info("Text    : '%s'", text)
+    logger.info("Subtext : '%s'", subtext)
 
     # Show preprocessing options (if present) – they are only added by the
     # ``calculate_substring_similarity`` wrapper.
     if any(k in results for k in ("case_sensitive", "ignore_whitespace", "normalize")):
         logger.info("\nPreprocessing Options:")
-        logger.info(f"Case Sensitive   : {results.get('case_sensitive')}")
-        logger.info(f"Ignore Whitespace: {results.get('ignore_whitespace')}")
-        logger.info(f"Normalize         : {results.get('normalize')}")
+        logger.info("Case Sensitive   : %s", results.get('case_sensitive'))
+        logger.info("Ignore Whitespace: %s", results.get('ignore_whitespace'))
+        logger.info("Normalize         : %s", results.get('normalize'))
 
     logger.info("\nMetrics:")
     # Avoid dumping the original raw strings again.
     for key, value in results.items():
         if key.startswith("original_"):
             continue
-        logger.info(f"{key:<20}: {value}")
+        logger.info("%-20s: %s", key, value)
 
 
 # ----------------------------------------------------------------------
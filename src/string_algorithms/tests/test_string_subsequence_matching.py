@@ -1,7 +1,6 @@
+import logging
 import unittest
-from io import StringIO
-from contextlib import redirect_stdout, redirect_stderr
-from string_algorithms import calculate_substring_similarity, print_comparison_details
+from string_algorithms import calculate_substring_similarity, calculate_substring_similarities, print_comparison_details
 
 __all__ = ['TestStringSimilarity']
 
@@ -179,6 +178,19 @@ class TestStringSimilarity(unittest.TestCase):
         self.assertEqual(results['gap_char_count'], 0)
         self.assertEqual(results['unmatched_char_count'], len(subtext))
 
+    def test_disjoint_alphabets(self):
+        """Test case for strings without a single character in common."""
+        text = "The quick brown fox " * 50
+        subtext = "日本語のテキスト"
+        results = calculate_substring_similarity(text, subtext)
+
+        self.assert_metrics_structure(results)
+        self.assertEqual(results['matched_char_count'], 0)
+        self.assertEqual(results['unmatched_char_count'], len(subtext))
+        self.assertEqual(results['replaced_char_count'], len(text))
+        self.assertEqual(results['replacements'], [(text, subtext)])
+        self.assertEqual(results['dissimilarity_score'], len(subtext) + len(text))
+
     def test_address_matching(self):
         """Test case for address matching."""
         text = "OFFICE OF ACQUISITION MANAGEMENT (A/LM/AQM) PO BOX 9115 ROSSLYN STATION US DEPARTMENT OF STATE ARLINGTON, VA 22219"
@@ -207,6 +219,22 @@ class TestStringSimilarity(unittest.TestCase):
         self.assertEqual(len(results['replacements']), 0)
         self.assertEqual(len(results['gaps']), 0)
 
+    def test_identical_strings(self):
+        """Test case for identical strings, including after preprocessing."""
+        text = "The quick brown fox"
+        results = calculate_substring_similarity(text, text)
+
+        self.assert_metrics_structure(results)
+        self.assertEqual(results['dissimilarity_score'], 0)
+        self.assertEqual(results['matched_char_count'], len(text))
+        self.assertEqual(results['matches'], [text])
+
+        results = calculate_substring_similarity("The Quick  Brown", "the quick brown",
+                                                 case_sensitive=False, ignore_whitespace=True)
+        self.assert_metrics_structure(results)
+        self.assertEqual(results['dissimilarity_score'], 0)
+        self.assertEqual(results['matches'], ["thequickbrown"])
+
     def test_single_character(self):
         """Test case for single character strings."""
         text = "A"
@@ -241,28 +269,131 @@ class TestStringSimilarity(unittest.TestCase):
         self.assertEqual(len(results['matches'][0]), 100)
         self.assertEqual(results['matches'][0], "A" * 100)
 
+    def test_long_subtext_no_autojunk(self):
+        """Test case for subtexts long enough to trigger difflib's autojunk."""
+        text = "A" * 1000
+        subtext = "A" * 300
+        results = calculate_substring_similarity(text, subtext)
+
+        self.assert_metrics_structure(results)
+        self.assertEqual(results['matched_char_count'], 300)
+        self.assertEqual(results['unmatched_char_count'], 0)
+        self.assertEqual(results['matches'], ["A" * 300])
+
+    def test_repeated_comparison_is_independent(self):
+        """Test case for repeated comparisons served from the cache."""
+        text = "The quick brown fox jumps over the lazy dog"
+        subtext = "quick brown cat"
+        first = calculate_substring_similarity(text, subtext)
+        first['matches'].append("tampered")
+        first['dissimilarity_score'] = -1
+
+        second = calculate_substring_similarity(text, subtext)
+        self.assert_metrics_structure(second)
+        self.assertNotIn("tampered", second['matches'])
+        self.assertGreater(second['dissimilarity_score'], 0)
+
+    def test_batch_matches_single_comparisons(self):
+        """Test case for comparing one subtext against many texts."""
+        texts = [
+            "123 Main Street, Springfield",
+            "123 main st springfield",
+            "",
+            "Springfield 123",
+            "日本語",
+        ]
+        subtext = "123 Main St"
+        for options in ({}, {'case_sensitive': False, 'ignore_whitespace': True}):
+            with self.subTest(options=options):
+                batch = calculate_substring_similarities(texts, subtext, **options)
+                self.assertEqual(len(batch), len(texts))
+                for text, results in zip(texts, batch):
+                    self.assert_metrics_structure(results)
+                    self.assertEqual(results, calculate_substring_similarity(text, subtext, **options))
+
+        # Duplicate texts get equal but independent results
+        batch = calculate_substring_similarities(["123 Main", "123 Main"], subtext)
+        self.assertEqual(batch[0], batch[1])
+        batch[0]['matches'].append("tampered")
+        self.assertNotIn("tampered", batch[1]['matches'])
+
+    def test_batch_max_dissimilarity(self):
+        """Test case for filtering a batch by dissimilarity score."""
+        texts = ["123 Main Street, Springfield", "Main", "xyz", "123 Main St"]
+        subtext = "123 Main St"
+        scores = [r['dissimilarity_score'] for r in calculate_substring_similarities(texts, subtext)]
+
+        for limit in (0, 3, 10, 100):
+            with self.subTest(limit=limit):
+                batch = calculate_substring_similarities(texts, subtext, max_dissimilarity=limit)
+                for score, results in zip(scores, batch):
+                    if score > limit:
+                        self.assertIsNone(results)
+                    else:
+                        self.assert_metrics_structure(results)
+                        self.assertEqual(results['dissimilarity_score'], score)
+
+        # Unknown matchers are rejected even when every text is pruned
+        with self.assertRaises(ValueError):
+            calculate_substring_similarities(["zzz"], "abc", matcher="bogus", max_dissimilarity=0)
+        with self.assertRaises(ValueError):
+            calculate_substring_similarities([], "abc", matcher="bogus")
+
+    def test_batch_workers(self):
+        """Test case for scoring a large batch in worker processes."""
+        texts = [f"{n} Main Street, Springfield" for n in range(1200)]
+        subtext = "120 Main St"
+        serial = calculate_substring_similarities(texts, subtext, max_dissimilarity=15)
+        parallel = calculate_substring_similarities(texts, subtext, max_dissimilarity=15, workers=2)
+        self.assertEqual(parallel, serial)
+
+        # Invalid worker counts are rejected regardless of the batch size
+        for workers in (0, -2, 1.5):
+            with self.subTest(workers=workers), self.assertRaises(ValueError):
+                calculate_substring_similarities(["abc"], subtext, workers=workers)
+
     def test_print_comparison_details(self):
         """Test case for print_comparison_details output format."""
         text = "Hello World"
         subtext = "hello"
         results = calculate_substring_similarity(text, subtext)
         
-        # Capture the printed output
-        output = StringIO()
-        with redirect_stderr(output):
-            print_comparison_details(text, subtext, results)
-        
-        printed_output = output.getvalue()
+        # Capture the log records directly rather than the rendered stream
+        logger = logging.getLogger(__name__)
+        with self.assertLogs(logger, level='INFO') as logs:
+            print_comparison_details(text, subtext, results, logger=logger)
+        messages = [record.getMessage().strip() for record in logs.records]
         
         # Verify the output format
-        self.assertIn("Input Strings:", printed_output)
-        self.assertIn(f"Text    : '{text}'", printed_output)
-        self.assertIn(f"Subtext : '{subtext}'", printed_output)
-        self.assertIn("Metrics:", printed_output)
+        self.assertIn("Input Strings:", messages)
+        self.assertIn(f"Text    : '{text}'", messages)
+        self.assertIn(f"Subtext : '{subtext}'", messages)
+        self.assertIn("Metrics:", messages)
         
-        # Verify all metrics are present in the output
-        for key in results.keys():
-            self.assertIn(key, printed_output)
+        # Verify all metrics are present in the output, one line each
+        logged_keys = {message.split(":", 1)[0].strip() for message in messages}
+        self.assertLessEqual(set(results.keys()), logged_keys)
+
+    def test_rapidfuzz_matchers(self):
+        """Test case for the optional RapidFuzz diff backends."""
+        text = "The quick brown fox jumps over the lazy dog"
+        subtext = "The Quick Brown fox jumped over the dog"
+        for matcher in ("levenshtein", "indel"):
+            with self.subTest(matcher=matcher):
+                results = calculate_substring_similarity(text, subtext, matcher=matcher)
+
+                self.assert_metrics_structure(results)
+                self.assertEqual(results['text_length'], len(text))
+                self.assertEqual(results['subtext_length'], len(subtext))
+                self.assertGreater(results['matched_char_count'], 0)
+                for match in results['matches']:
+                    self.assertIn(match, text)
+                    self.assertIn(match, subtext)
+
+        with self.assertRaises(ValueError):
+            calculate_substring_similarity(text, subtext, matcher="unknown")
+        with self.assertRaises(ValueError):
+            calculate_substring_similarity(text, text, matcher="unknown")
 
     def test_unicode_normalization(self):
         """Test case for Unicode normalization."""
@@ -1,4 +1,5 @@
 import os
+import time
 import pathlib
 import logging
 import psutil
@@ -18,6 +19,45 @@ __all__ = ['log_memory_usage_function', 'configure_logger', 'logger']
 # Process for memory measurements
 _process = psutil.Process(os.getpid())
 
+_STATM_PATH = '/proc/self/statm'
+_PAGE_SIZE = os.sysconf('SC_PAGE_SIZE') if hasattr(os, 'sysconf') else 4096
+
+
+def _memory_from_statm():
+    """Return (rss, vms) in bytes from /proc/self/statm: one small read, no psutil objects."""
+    # Opened per call: "self" must resolve to the current process, also after a fork.
+    with open(_STATM_PATH, 'rb') as f:
+        vms_pages, rss_pages = f.read().split()[:2]
+    return int(rss_pages) * _PAGE_SIZE, int(vms_pages) * _PAGE_SIZE
+
+
+def _memory_from_psutil():
+    """Return (rss, vms) in bytes via psutil, for platforms without /proc."""
+    global _process
+    # A forked worker inherits the parent's Process; re-create it for the new pid.
+    if _process.pid != os.getpid():
+        _process = psutil.Process(os.getpid())
+    mem = _process.memory_info()
+    return mem.rss, mem.vms
+
+
+_memory_usage = _memory_from_statm if os.path.exists(_STATM_PATH) else _memory_from_psutil
+
+# Log records reuse a memory sample for this many seconds (LOG_MEMORY_TTL);
+# RSS barely moves between lines logged in quick succession.
+_MEMORY_TTL = float(os.getenv('LOG_MEMORY_TTL', '0.1'))
+_memory_sample = (float('-inf'), 0, 0)  # (monotonic time, rss, vms)
+
+
+def _sampled_memory_usage():
+    """Return (rss, vms) in bytes, sampled at most once per _MEMORY_TTL seconds."""
+    global _memory_sample
+    sample = _memory_sample
+    now = time.monotonic()
+    if now - sample[0] >= _MEMORY_TTL:
+        sample = _memory_sample = (now, *_memory_usage())
+    return sample[1], sample[2]
+
 # Define emojis for log levels
 LOG_EMOJIS = {
     'DEBUG': '🐛',
@@ -32,17 +72,19 @@ LOG_EMOJIS = {
 # -----------------------------
 _old_factory = logging.getLogRecordFactory()
 
+# Docker container ID; the environment does not change while we run
+_CONTAINER_ID = os.getenv('HOSTNAME', 'unknown')
+
 
 def record_factory(*args, **kwargs):
     record = _old_factory(*args, **kwargs)
 
-    # Docker container ID
-    record.container_id = os.getenv('HOSTNAME', 'unknown')
+    record.container_id = _CONTAINER_ID
 
     # Memory info
-    mem = _process.memory_info()
-    record.mem_rss = mem.rss / (1024 ** 2)
-    record.mem_vms = mem.vms / (1024 ** 2)
+    rss, vms = _sampled_memory_usage()
+    record.mem_rss = rss / (1024 ** 2)
+    record.mem_vms = vms / (1024 ** 2)
 
     # Add emoji based on log level
     record.emoji = LOG_EMOJIS.get(record.levelname, '❓')
@@ -53,10 +95,10 @@ def record_factory(*args, **kwargs):
 # Function for Memory Profiling
 # -----------------------------
 def log_memory_usage_function(tag: str):
-    proc = psutil.Process(os.getpid())
-    rss = proc.memory_info().rss  / (1024 * 1024)
-    vms = proc.memory_info().vms  / (1024 * 1024)
-    logger.info(f"{tag} | 🧠 RSS={rss:.2f}MB 💾 VMS={vms:.2f}MB")
+    rss, vms = _memory_usage()
+    rss /= 1024 * 1024
+    vms /= 1024 * 1024
+    logger.info("%s | 🧠 RSS=%.2fMB 💾 VMS=%.2fMB", tag, rss, vms)
     return rss, vms
 
 